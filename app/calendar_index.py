@@ -0,0 +1,119 @@
+import calendar
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import Column, Float, Integer, MetaData, Table, func, inspect, select, text
+from sqlalchemy.exc import OperationalError
+from app import models
+
+# R*Tree side index over (owner_id, [start, end]) of every non-deleted task that
+# has a start or end datetime. Both bounds are unix seconds; a task with only
+# one of them is indexed as an instant. Triggers on tasks keep it in sync, so
+# every write path (batched or not) is covered.
+#
+# It lives outside Base.metadata because create_all can't create virtual tables.
+task_spans = Table(
+    "task_spans",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("owner_lo", Float),
+    Column("owner_hi", Float),
+    Column("span_start", Float),
+    Column("span_end", Float),
+)
+
+# Set by ensure_calendar_index(); False when SQLite was built without R*Tree
+rtree_available = False
+
+# Longest window a calendar request may ask for, about two months
+MAX_WINDOW = timedelta(days=62)
+
+_QUALIFIES = "COALESCE({row}.is_deleted, 0) = 0 AND COALESCE({row}.start_datetime, {row}.end_datetime) IS NOT NULL"
+_SPAN_ROW = (
+    "SELECT {row}.id, {row}.owner_id, {row}.owner_id, "
+    "MIN(CAST(strftime('%s', COALESCE({row}.start_datetime, {row}.end_datetime)) AS INTEGER), "
+    "CAST(strftime('%s', COALESCE({row}.end_datetime, {row}.start_datetime)) AS INTEGER)), "
+    "MAX(CAST(strftime('%s', COALESCE({row}.start_datetime, {row}.end_datetime)) AS INTEGER), "
+    "CAST(strftime('%s', COALESCE({row}.end_datetime, {row}.start_datetime)) AS INTEGER))"
+)
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS task_spans_insert AFTER INSERT ON tasks
+    WHEN {_QUALIFIES.format(row="NEW")}
+    BEGIN
+        INSERT INTO task_spans {_SPAN_ROW.format(row="NEW")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_spans_update
+    AFTER UPDATE OF start_datetime, end_datetime, owner_id, is_deleted ON tasks
+    BEGIN
+        DELETE FROM task_spans WHERE id = OLD.id;
+        INSERT INTO task_spans {_SPAN_ROW.format(row="NEW")} WHERE {_QUALIFIES.format(row="NEW")};
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_spans_delete AFTER DELETE ON tasks
+    BEGIN
+        DELETE FROM task_spans WHERE id = OLD.id;
+    END""",
+]
+
+def ensure_calendar_index(engine):
+    """Create the R*Tree, its triggers, and backfill it on first run"""
+    global rtree_available
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        created = not inspect(conn).has_table("task_spans")
+        try:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS task_spans "
+                "USING rtree(id, owner_lo, owner_hi, span_start, span_end)"
+            ))
+        except OperationalError:
+            print("⚠️ SQLite has no R*Tree support, calendar queries will not use a side index")
+            return
+        for trigger in TRIGGERS:
+            conn.execute(text(trigger))
+        if created:
+            conn.execute(text(
+                f"INSERT INTO task_spans {_SPAN_ROW.format(row='tasks')} "
+                f"FROM tasks WHERE {_QUALIFIES.format(row='tasks')}"
+            ))
+    rtree_available = True
+
+def _epoch_seconds(value: datetime) -> int:
+    # Datetimes are stored as naive wall-clock strings, so compare the same way
+    return calendar.timegm(value.replace(tzinfo=None).timetuple())
+
+def check_window(start: datetime, end: datetime):
+    """Reject windows that are reversed or longer than MAX_WINDOW"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if end - start > MAX_WINDOW:
+        raise HTTPException(status_code=400, detail=f"The window may span at most {MAX_WINDOW.days} days")
+
+def filter_overlapping(query, start: datetime, end: datetime, owner_id: int = None):
+    """Restrict a Task query to tasks whose [start, end] overlaps [start, end]"""
+    task_start = func.coalesce(models.Task.start_datetime, models.Task.end_datetime)
+    task_end = func.coalesce(models.Task.end_datetime, models.Task.start_datetime)
+
+    if rtree_available:
+        conditions = [
+            task_spans.c.span_start <= _epoch_seconds(end),
+            task_spans.c.span_end >= _epoch_seconds(start),
+        ]
+        if owner_id is not None:
+            conditions += [task_spans.c.owner_lo <= owner_id, task_spans.c.owner_hi >= owner_id]
+        # Only live tasks are indexed, so the R*Tree alone rules out deleted ones
+        query = query.filter(models.Task.id.in_(select(task_spans.c.id).where(*conditions)))
+        if owner_id is not None:
+            # Coordinates are 32-bit floats, so owner ids above 2**24 share
+            # boxes with their neighbours and need the exact check as well.
+            # "+ 0" keeps SQLite from walking the owner B-tree index for it
+            # instead of looking up the R*Tree hits by id
+            query = query.filter(models.Task.owner_id + 0 == owner_id)
+    else:
+        query = query.filter(models.Task.is_deleted == False)
+        if owner_id is not None:
+            query = query.filter(models.Task.owner_id == owner_id)
+
+    # Exact check; the R*Tree stores 32-bit floats and only narrows candidates
+    return query.filter(task_start <= end, task_end >= start).order_by(task_start, models.Task.id)
@@ -5,4 +5,16 @@ load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./taskmanager.db")
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
\ No newline at end of file
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+# Per-process summary cache; entries are re-validated against the database
+# before use, so writes handled by other workers are seen right away
+TASK_SUMMARY_CACHE_SECONDS = float(os.getenv("TASK_SUMMARY_CACHE_SECONDS", "30"))
+
+# Group-commit task writes: queue them onto one writer that commits in batches
+TASK_WRITE_BATCHING = os.getenv("TASK_WRITE_BATCHING", "false").lower() in ("1", "true", "yes")
+TASK_WRITE_BATCH_SIZE = int(os.getenv("TASK_WRITE_BATCH_SIZE", "64"))
+TASK_WRITE_BATCH_DELAY_MS = float(os.getenv("TASK_WRITE_BATCH_DELAY_MS", "5"))
+
+# Task history events are flushed in the background in batches
+TASK_EVENT_BATCH_SIZE = int(os.getenv("TASK_EVENT_BATCH_SIZE", "500"))
+TASK_EVENT_FLUSH_MS = float(os.getenv("TASK_EVENT_FLUSH_MS", "200"))
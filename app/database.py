@@ -1,12 +1,28 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from app.config import DATABASE_URL
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./taskmanager.db"
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def _use_wal(dbapi_connection, connection_record):
+    # In the default rollback journal a committing writer waits for every
+    # reader and blocks new ones, so concurrent requests time out on the lock.
+    # WAL lets reads run alongside the single writer
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+def create_db_engine(**kwargs):
+    is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+    db_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        **kwargs
+    )
+    if is_sqlite:
+        event.listen(db_engine, "connect", _use_wal)
+    return db_engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
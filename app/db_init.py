@@ -1,11 +1,26 @@
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine, Base
 from app import models, security
+from app.calendar_index import ensure_calendar_index
 
 def init_db():
     # Create tables
     Base.metadata.create_all(bind=engine)
 
+    # create_all doesn't add columns to existing tables
+    task_columns = {column["name"] for column in inspect(engine).get_columns("tasks")}
+    if "version" not in task_columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+    # create_all skips indexes on tables that already exist
+    for index in models.Task.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    # R*Tree side index for calendar (time window) queries
+    ensure_calendar_index(engine)
+
     db: Session = SessionLocal()
     # Check if admin exists
     admin = db.query(models.User).filter_by(username="admin").first()
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import CORS_ORIGINS
+from app.config import CORS_ORIGINS, TASK_WRITE_BATCHING
 from app.db_init import init_db
 from app.routers import auth, tasks, users, stats, admin
+from app.write_batcher import task_writer
+from app.task_history import task_events
 
 app = FastAPI()
 
@@ -18,6 +20,15 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    if TASK_WRITE_BATCHING:
+        task_writer.start()
+    task_events.start()
+
+# Flush queued task writes and history events before exiting
+@app.on_event("shutdown")
+def on_shutdown():
+    task_writer.stop()
+    task_events.stop()
 
 app.include_router(auth.router)
 app.include_router(tasks.router)
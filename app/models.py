@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db_init import Base
@@ -36,6 +36,35 @@ class Task(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     updated_by = Column(Integer, ForeignKey("users.id"))
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every write, for optimistic concurrency
     owner = relationship("User", back_populates="tasks", foreign_keys=[owner_id])
     creator = relationship("User", foreign_keys=[created_by])
     updater = relationship("User", foreign_keys=[updated_by])
+
+    # Indexes backing the filters and sort keys of GET /tasks (owner scoped)
+    # and GET /admin/tasks (across owners)
+    __table_args__ = (
+        Index("ix_tasks_owner_created", "owner_id", "is_deleted", "created_at"),
+        Index("ix_tasks_owner_updated", "owner_id", "is_deleted", "updated_at"),
+        Index("ix_tasks_owner_due", "owner_id", "is_deleted", "due_datetime"),
+        Index("ix_tasks_owner_status_priority", "owner_id", "is_deleted", "status", "priority"),
+        Index("ix_tasks_created", "is_deleted", "created_at"),
+        Index("ix_tasks_updated", "is_deleted", "updated_at"),
+        Index("ix_tasks_due", "is_deleted", "due_datetime"),
+        Index("ix_tasks_status_priority", "is_deleted", "status", "priority"),
+    )
+
+class TaskEvent(Base):
+    """Append-only history of task writes, filled in the background by app.task_history"""
+    __tablename__ = "task_events"
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    actor_id = Column(Integer, ForeignKey("users.id"))
+    action = Column(String, nullable=False)  # "created", "updated" or "deleted"
+    changes = Column(JSON, nullable=False, default=dict)  # field -> new value
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # History is read per task, newest first
+    __table_args__ = (
+        Index("ix_task_events_task_id_id", "task_id", "id"),
+    )
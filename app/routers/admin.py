@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, insert
 from typing import List, Optional
+from datetime import datetime
 from app import models, schemas
 from app.deps import get_db, get_current_admin
+from app.task_filters import apply_task_filters, apply_task_sort
+from app.task_summary import get_task_summary, invalidate_task_summary
+from app.write_batcher import run_write
+from app.task_history import task_events
+from app.calendar_index import check_window, filter_overlapping
+from app.task_import import detect_format, import_tasks
 import math
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -11,6 +18,13 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 @router.get("/tasks", response_model=schemas.PaginatedTasksResponse)
 def search_tasks(
     search: Optional[str] = Query(None, description="Search term for task title, description, or user info"),
+    status: Optional[List[str]] = Query(None, description="Filter by status (repeat or comma-separate for several)"),
+    priority: Optional[List[str]] = Query(None, description="Filter by priority (repeat or comma-separate for several)"),
+    due_before: Optional[datetime] = Query(None, description="Only tasks due before this datetime"),
+    due_after: Optional[datetime] = Query(None, description="Only tasks due at or after this datetime"),
+    owner_id: Optional[int] = Query(None, description="Only tasks owned by this user"),
+    sort: str = Query("created_at", pattern="^(created_at|due_datetime|priority|updated_at)$", description="Sort key"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="Sort direction, defaults per sort key"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     db: Session = Depends(get_db), 
@@ -46,6 +60,15 @@ def search_tasks(
                 )
             )
     
+    query = apply_task_filters(
+        query,
+        status=status,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after,
+        owner_id=owner_id
+    )
+    
     # Get total count for pagination
     total_items = query.count()
     
@@ -53,8 +76,8 @@ def search_tasks(
     total_pages = math.ceil(total_items / limit) if total_items > 0 else 1
     offset = (page - 1) * limit
     
-    # Apply pagination
-    tasks = query.offset(offset).limit(limit).all()
+    # Apply sorting and pagination
+    tasks = apply_task_sort(query, sort, order).offset(offset).limit(limit).all()
     
     # Build pagination info
     pagination = schemas.PaginationInfo(
@@ -71,6 +94,24 @@ def search_tasks(
         pagination=pagination
     )
 
+@router.get("/tasks/calendar", response_model=List[schemas.TaskWithUserOut])
+def get_calendar(
+    from_: datetime = Query(..., alias="from", description="Start of the visible window"),
+    to: datetime = Query(..., description="End of the visible window"),
+    limit: int = Query(500, ge=1, le=1000, description="Most tasks to return, earliest first"),
+    owner_id: Optional[int] = Query(None, description="Only tasks owned by this user"),
+    db: Session = Depends(get_db),
+    admin: models.User = Depends(get_current_admin)
+):
+    """Tasks of all users whose start/end span overlaps the window (admin only)"""
+    check_window(from_, to)
+    
+    query = db.query(models.Task).join(models.User, models.Task.owner_id == models.User.id).filter(
+        models.User.is_deleted == False
+    ).options(joinedload(models.Task.owner))
+    
+    return filter_overlapping(query, from_, to, owner_id=owner_id).limit(limit).all()
+
 @router.post("/users/{user_id}/tasks", response_model=schemas.TaskOut)
 def create_task_for_user(
     user_id: int, 
@@ -88,7 +129,7 @@ def create_task_for_user(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Create task
-    db_task = models.Task(
+    values = dict(
         title=task.title,
         description=task.description,
         status=task.status,
@@ -100,7 +141,39 @@ def create_task_for_user(
         created_by=admin.id,
         updated_by=admin.id
     )
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return db_task
\ No newline at end of file
+    
+    def write(session: Session):
+        return session.execute(
+            insert(models.Task).values(**values).returning(*models.Task.__table__.columns)
+        ).first()._asdict()
+    
+    db_task = run_write(db, write)
+    invalidate_task_summary(user_id)
+    task_events.record(db_task["id"], admin.id, "created", values)
+    return db_task
+
+@router.get("/users/{user_id}/summary", response_model=schemas.TaskSummary)
+def get_user_task_summary(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: models.User = Depends(get_current_admin)
+):
+    """Task summary for a specific user (admin only)"""
+    user = db.query(models.User).filter(
+        models.User.id == user_id,
+        models.User.is_deleted == False
+    ).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return get_task_summary(db, user_id)
+
+@router.post("/tasks/import", response_model=schemas.TaskImportResult)
+def import_tasks_from_file(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON; each row needs a username"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Overrides detection by file extension"),
+    db: Session = Depends(get_db),
+    admin: models.User = Depends(get_current_admin)
+):
+    """Bulk-create tasks for users by username, reporting rows that failed (admin only)"""
+    return import_tasks(db, file, detect_format(file, format), admin)
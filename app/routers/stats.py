@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from app import models
 from app.deps import get_db, get_current_admin
 
@@ -10,7 +11,7 @@ def get_stats(db: Session = Depends(get_db), admin: models.User = Depends(get_cu
     total_users = db.query(models.User).count()
     total_tasks = db.query(models.Task).count()
     tasks_by_status = (
-        db.query(models.Task.status, db.func.count(models.Task.id))
+        db.query(models.Task.status, func.count(models.Task.id))
         .group_by(models.Task.status)
         .all()
     )
@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import case, insert, update
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 from app import models, schemas
 from app.deps import get_db, get_current_user
+from app.task_filters import apply_task_filters, apply_task_sort
+from app.task_summary import get_task_summary, invalidate_task_summary, invalidate_all_task_summaries
+from app.write_batcher import run_write
+from app.task_history import task_events
+from app.calendar_index import check_window, filter_overlapping
+import math
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.get("/", response_model=schemas.PaginatedUserTasksResponse)
 def get_my_tasks(
     search: Optional[str] = Query(None, description="Search term for task title or description"),
+    status: Optional[List[str]] = Query(None, description="Filter by status (repeat or comma-separate for several)"),
+    priority: Optional[List[str]] = Query(None, description="Filter by priority (repeat or comma-separate for several)"),
+    due_before: Optional[datetime] = Query(None, description="Only tasks due before this datetime"),
+    due_after: Optional[datetime] = Query(None, description="Only tasks due at or after this datetime"),
+    sort: str = Query("created_at", pattern="^(created_at|due_datetime|priority|updated_at)$", description="Sort key"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="Sort direction, defaults per sort key"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     db: Session = Depends(get_db), 
@@ -39,16 +52,17 @@ def get_my_tasks(
                 models.Task.description.ilike(search_term)
             )
     
+    query = apply_task_filters(query, status=status, priority=priority, due_before=due_before, due_after=due_after)
+    
     # Get total count for pagination
     total_items = query.count()
     
     # Calculate pagination
-    import math
     total_pages = math.ceil(total_items / limit) if total_items > 0 else 1
     offset = (page - 1) * limit
     
-    # Apply pagination and order by creation date (newest first)
-    tasks = query.order_by(models.Task.created_at.desc()).offset(offset).limit(limit).all()
+    # Apply sorting (newest first by default) and pagination
+    tasks = apply_task_sort(query, sort, order).offset(offset).limit(limit).all()
     
     # Build pagination info
     pagination = schemas.PaginationInfo(
@@ -65,40 +79,90 @@ def get_my_tasks(
         pagination=pagination
     )
 
+@router.get("/summary", response_model=schemas.TaskSummary)
+def get_my_task_summary(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """Counts by status and priority, overdue count and completion rate for the user's tasks"""
+    return get_task_summary(db, current_user.id)
+
+@router.get("/calendar", response_model=List[schemas.TaskOut])
+def get_my_calendar(
+    from_: datetime = Query(..., alias="from", description="Start of the visible window"),
+    to: datetime = Query(..., description="End of the visible window"),
+    limit: int = Query(500, ge=1, le=1000, description="Most tasks to return, earliest first"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """User's tasks whose start/end span overlaps the window"""
+    check_window(from_, to)
+    
+    query = filter_overlapping(db.query(models.Task), from_, to, owner_id=current_user.id)
+    return query.limit(limit).all()
+
 @router.post("/", response_model=schemas.TaskOut)
 def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     # Validate priority
     if task.priority and task.priority not in ["low", "medium", "high", "urgent"]:
         raise HTTPException(status_code=400, detail="priority must be one of: low, medium, high, urgent")
     
-    db_task = models.Task(**task.dict(), owner_id=current_user.id, created_by=current_user.id, updated_by=current_user.id)
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    values = dict(task.dict(), owner_id=current_user.id, created_by=current_user.id, updated_by=current_user.id)
+    
+    def write(session: Session):
+        return session.execute(
+            insert(models.Task).values(**values).returning(*models.Task.__table__.columns)
+        ).first()._asdict()
+    
+    db_task = run_write(db, write)
+    invalidate_task_summary(current_user.id)
+    task_events.record(db_task["id"], current_user.id, "created", values)
     return db_task
 
-@router.put("/{task_id}", response_model=schemas.TaskOut)
-def update_task(task_id: int, updated: schemas.TaskUpdate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    # Build query based on user type
-    if current_user.is_admin:
-        # Admin can update any task
-        task = db.query(models.Task).filter(
-            models.Task.id == task_id,
-            models.Task.is_deleted == False
-        ).first()
-    else:
-        # Regular user can only update their own tasks
-        task = db.query(models.Task).filter(
-            models.Task.id == task_id,
-            models.Task.owner_id == current_user.id,
-            models.Task.is_deleted == False
-        ).first()
+def _expected_version(if_match: Optional[str], version: Optional[int]) -> Optional[int]:
+    """Resolve the version the client expects from If-Match and/or an explicit version"""
+    header_version = None
+    # "*" matches any current version, so it adds no condition
+    if if_match is not None and if_match.strip() != "*":
+        tag = if_match.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        try:
+            header_version = int(tag.strip('"'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="If-Match must be a task version")
     
-    if not task:
+    if header_version is not None and version is not None and header_version != version:
+        raise HTTPException(status_code=400, detail="If-Match and version do not match")
+    return header_version if header_version is not None else version
+
+def _task_conditions(task_id: int, current_user: models.User, expected_version: Optional[int], include_deleted: bool = False):
+    """WHERE clause for a task: admins may touch any task, users only their own"""
+    conditions = [models.Task.id == task_id]
+    if not include_deleted:
+        conditions.append(models.Task.is_deleted == False)
+    if not current_user.is_admin:
+        conditions.append(models.Task.owner_id == current_user.id)
+    if expected_version is not None:
+        conditions.append(models.Task.version == expected_version)
+    return conditions
+
+def _raise_write_failure(db: Session, task_id: int, current_user: models.User):
+    """The conditional UPDATE matched nothing: tell a missing task from a stale version"""
+    exists = db.query(models.Task.id).filter(*_task_conditions(task_id, current_user, None)).first()
+    if not exists:
         raise HTTPException(status_code=404, detail="Task not found")
-    
+    raise HTTPException(status_code=409, detail="Task was modified by another request, reload and retry")
+
+@router.put("/{task_id}", response_model=schemas.TaskOut)
+def update_task(
+    task_id: int,
+    updated: schemas.TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
     # Get update data
     update_data = updated.dict(exclude_unset=True)
+    expected_version = _expected_version(if_match, update_data.pop("version", None))
     
     # Restrict normal users to only update start_datetime, end_datetime, and status
     if not current_user.is_admin:
@@ -110,13 +174,6 @@ def update_task(task_id: int, updated: schemas.TaskUpdate, db: Session = Depends
                 detail=f"Normal users can only update start_datetime, end_datetime, and status. Restricted fields: {', '.join(restricted_fields)}"
             )
     
-    # Auto-set completion_datetime when status changes to "completed"
-    if update_data.get("status") == "completed" and task.status != "completed":
-        update_data["completion_datetime"] = datetime.now(timezone.utc)
-    elif update_data.get("status") != "completed" and task.status == "completed":
-        # Clear completion_datetime if status changes from completed to something else
-        update_data["completion_datetime"] = None
-    
     # Admin-only validations
     if current_user.is_admin:
         # Validate priority if provided
@@ -134,39 +191,118 @@ def update_task(task_id: int, updated: schemas.TaskUpdate, db: Session = Depends
             if target_user.is_admin:
                 raise HTTPException(status_code=400, detail="Cannot assign tasks to admin users")
     
+    # Auto-set completion_datetime when status changes to "completed" and clear it
+    # when status moves away from "completed"; the current status is only known
+    # to the database, so decide inside the UPDATE
+    if "status" in update_data:
+        if update_data["status"] == "completed":
+            update_data["completion_datetime"] = case(
+                (models.Task.status == "completed", models.Task.completion_datetime),
+                else_=datetime.now(timezone.utc)
+            )
+        else:
+            update_data["completion_datetime"] = None
+    
     # Set updated_by for all updates
     update_data["updated_by"] = current_user.id
+    update_data["version"] = models.Task.version + 1
+    
+    # Check ownership/version and write in one statement
+    def write(session: Session):
+        row = session.execute(
+            update(models.Task)
+            .where(*_task_conditions(task_id, current_user, expected_version))
+            .values(**update_data)
+            .returning(*models.Task.__table__.columns)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            _raise_write_failure(session, task_id, current_user)
+        return row._asdict()
+    
+    task = run_write(db, write)
+    
+    if "owner_id" in update_data:
+        # The previous owner isn't returned by the UPDATE
+        invalidate_all_task_summaries()
+    else:
+        invalidate_task_summary(task["owner_id"])
+    
+    # Record the values the UPDATE actually wrote
+    task_events.record(task_id, current_user.id, "updated", {key: task[key] for key in update_data})
     
-    for key, value in update_data.items():
-        setattr(task, key, value)
-    db.commit()
-    db.refresh(task)
+    response.headers["ETag"] = f'"{task["version"]}"'
     return task
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    # Build query based on user type
-    if current_user.is_admin:
-        # Admin can delete any task
-        task = db.query(models.Task).filter(
-            models.Task.id == task_id,
-            models.Task.is_deleted == False
-        ).first()
-    else:
-        # Regular user can only delete their own tasks
-        task = db.query(models.Task).filter(
-            models.Task.id == task_id,
-            models.Task.owner_id == current_user.id,
-            models.Task.is_deleted == False
+def delete_task(
+    task_id: int,
+    version: Optional[int] = Query(None, description="Expected task version"),
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    expected_version = _expected_version(if_match, version)
+    
+    # Soft delete the task in one statement
+    def write(session: Session):
+        row = session.execute(
+            update(models.Task)
+            .where(*_task_conditions(task_id, current_user, expected_version))
+            .values(
+                is_deleted=True,
+                deleted_at=datetime.now(timezone.utc),
+                updated_by=current_user.id,
+                version=models.Task.version + 1
+            )
+            .returning(models.Task.title, models.Task.owner_id)
+            .execution_options(synchronize_session=False)
         ).first()
+        if row is None:
+            _raise_write_failure(session, task_id, current_user)
+        return row._asdict()
+    
+    task = run_write(db, write)
+    invalidate_task_summary(task["owner_id"])
+    task_events.record(task_id, current_user.id, "deleted")
     
+    return {"message": f"Task '{task['title']}' deleted successfully"}
+
+@router.get("/{task_id}/history", response_model=schemas.PaginatedTaskEventsResponse)
+def get_task_history(
+    task_id: int,
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Who changed which fields of a task and when, newest first"""
+    # A deleted task's history stays readable, that's when it's wanted most
+    task = db.query(models.Task.id).filter(*_task_conditions(task_id, current_user, None, include_deleted=True)).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Soft delete the task
-    task.is_deleted = True
-    task.deleted_at = datetime.now(timezone.utc)
-    task.updated_by = current_user.id
-    db.commit()
+    query = db.query(models.TaskEvent).filter(models.TaskEvent.task_id == task_id)
     
-    return {"message": f"Task '{task.title}' deleted successfully"}
+    # Get total count for pagination
+    total_items = query.count()
+    
+    # Calculate pagination
+    total_pages = math.ceil(total_items / limit) if total_items > 0 else 1
+    offset = (page - 1) * limit
+    
+    events = query.order_by(models.TaskEvent.id.desc()).offset(offset).limit(limit).all()
+    
+    pagination = schemas.PaginationInfo(
+        current_page=page,
+        total_pages=total_pages,
+        total_items=total_items,
+        items_per_page=limit,
+        has_next=page < total_pages,
+        has_previous=page > 1
+    )
+    
+    return schemas.PaginatedTaskEventsResponse(
+        events=events,
+        pagination=pagination
+    )
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
-from datetime import datetime
-from typing import Optional
+from sqlalchemy import func, case
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 from app import models, schemas, security
 from app.deps import get_db, get_current_admin
+from app.task_summary import grouping_key, overdue_condition
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -52,9 +53,36 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db), admin:
         else:
             raise HTTPException(status_code=400, detail="Data integrity error")
 
-@router.get("/", response_model=schemas.PaginatedUsersResponse)
+def task_stats_for_users(db: Session, user_ids: List[int]) -> Dict[int, schemas.UserTaskStats]:
+    """Per-user task counts by status plus overdue, in one grouped query over the given users"""
+    stats = {user_id: schemas.UserTaskStats(total=0, open=0, overdue=0, by_status={}) for user_id in user_ids}
+    if not user_ids:
+        return stats
+    
+    status = grouping_key(models.Task.status)
+    rows = db.query(
+        models.Task.owner_id,
+        status,
+        func.count(models.Task.id),
+        func.sum(case((overdue_condition(datetime.now(timezone.utc)), 1), else_=0))
+    ).filter(
+        models.Task.owner_id.in_(user_ids),
+        models.Task.is_deleted == False
+    ).group_by(models.Task.owner_id, status).all()
+    
+    for owner_id, status, count, overdue in rows:
+        user_stats = stats[owner_id]
+        user_stats.total += count
+        user_stats.overdue += overdue or 0
+        if status != "completed":
+            user_stats.open += count
+        user_stats.by_status[status] = count
+    return stats
+
+@router.get("/", response_model=schemas.PaginatedUsersResponse, response_model_exclude_none=True)
 def list_users(
     search: Optional[str] = Query(None, description="Search term for username or email"),
+    with_task_stats: bool = Query(False, description="Include each user's task counts by status and overdue count"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     db: Session = Depends(get_db), 
@@ -82,6 +110,12 @@ def list_users(
     offset = (page - 1) * limit
     users = query.offset(offset).limit(limit).all()
     
+    if with_task_stats:
+        stats = task_stats_for_users(db, [user.id for user in users])
+        users = [schemas.UserWithTaskStatsOut.model_validate(user) for user in users]
+        for user in users:
+            user.task_stats = stats[user.id]
+    
     # Calculate pagination metadata
     total_pages = (total_count + limit - 1) // limit
     has_next = page < total_pages
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 # ---------- User Schemas ----------
@@ -38,8 +38,17 @@ class PaginationInfo(BaseModel):
     has_next: bool
     has_previous: bool
 
+class UserTaskStats(BaseModel):
+    total: int
+    open: int  # anything not completed
+    overdue: int
+    by_status: Dict[str, int]
+
+class UserWithTaskStatsOut(UserOut):
+    task_stats: Optional[UserTaskStats] = None  # only with ?with_task_stats=true
+
 class PaginatedUsersResponse(BaseModel):
-    users: List[UserOut]
+    users: List[UserWithTaskStatsOut]
     pagination: PaginationInfo
 
 # ---------- Task Schemas ----------
@@ -73,6 +82,7 @@ class TaskUpdate(BaseModel):
     start_datetime: Optional[datetime] = None
     end_datetime: Optional[datetime] = None
     due_datetime: Optional[datetime] = None
+    version: Optional[int] = None  # Expected current version, alternative to If-Match
 
 class TaskOut(TaskBase):
     id: int
@@ -82,6 +92,7 @@ class TaskOut(TaskBase):
     created_by: Optional[int] = None
     updated_at: Optional[datetime] = None
     updated_by: Optional[int] = None
+    version: int = 1
 
     class Config:
         from_attributes = True
@@ -94,6 +105,7 @@ class TaskWithUserOut(TaskBase):
     created_by: Optional[int] = None
     updated_at: Optional[datetime] = None
     updated_by: Optional[int] = None
+    version: int = 1
     owner: UserOut
 
     class Config:
@@ -107,6 +119,38 @@ class PaginatedUserTasksResponse(BaseModel):
     tasks: List[TaskOut]
     pagination: PaginationInfo
 
+class TaskSummary(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    overdue: int
+    completed: int
+    completion_rate: float
+
+class TaskEventOut(BaseModel):
+    id: int
+    task_id: int
+    actor_id: Optional[int] = None
+    action: str
+    changes: Dict[str, Any]
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class PaginatedTaskEventsResponse(BaseModel):
+    events: List[TaskEventOut]
+    pagination: PaginationInfo
+
+class TaskImportError(BaseModel):
+    row: int  # 1-based data row (CSV header and blank NDJSON lines not counted)
+    errors: List[str]
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]  # capped, see failed for the full count
+
 # ---------- Auth Schemas ----------
 class Token(BaseModel):
     access_token: str
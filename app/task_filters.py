@@ -0,0 +1,72 @@
+from fastapi import HTTPException
+from sqlalchemy import case
+from datetime import datetime
+from typing import List, Optional
+from app import models
+
+PRIORITIES = ["low", "medium", "high", "urgent"]
+SORT_FIELDS = ["created_at", "due_datetime", "priority", "updated_at"]
+
+# Default direction per sort key when the client doesn't pass one
+DEFAULT_SORT_ORDER = {
+    "created_at": "desc",
+    "updated_at": "desc",
+    "due_datetime": "asc",
+    "priority": "desc",
+}
+
+# Rank priorities by urgency instead of alphabetically
+PRIORITY_RANK = case(
+    {"low": 0, "medium": 1, "high": 2, "urgent": 3},
+    value=models.Task.priority,
+    else_=-1,
+)
+
+def split_multi(values: Optional[List[str]]) -> List[str]:
+    """Accept both ?status=a&status=b and ?status=a,b"""
+    if not values:
+        return []
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+def apply_task_filters(
+    query,
+    status: Optional[List[str]] = None,
+    priority: Optional[List[str]] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    owner_id: Optional[int] = None,
+):
+    statuses = split_multi(status)
+    priorities = split_multi(priority)
+
+    invalid = [p for p in priorities if p not in PRIORITIES]
+    if invalid:
+        raise HTTPException(status_code=400, detail="priority must be one of: low, medium, high, urgent")
+
+    if owner_id is not None:
+        query = query.filter(models.Task.owner_id == owner_id)
+    if statuses:
+        query = query.filter(models.Task.status.in_(statuses))
+    if priorities:
+        query = query.filter(models.Task.priority.in_(priorities))
+    if due_before is not None:
+        query = query.filter(models.Task.due_datetime < due_before)
+    if due_after is not None:
+        query = query.filter(models.Task.due_datetime >= due_after)
+    return query
+
+def apply_task_sort(query, sort: str = "created_at", order: Optional[str] = None):
+    direction = order or DEFAULT_SORT_ORDER[sort]
+    column = PRIORITY_RANK if sort == "priority" else getattr(models.Task, sort)
+
+    if direction == "asc":
+        key, tie_breaker = column.asc(), models.Task.id.asc()
+    else:
+        key, tie_breaker = column.desc(), models.Task.id.desc()
+
+    # Tasks without a due date go last in either direction
+    if sort == "due_datetime":
+        key = key.nulls_last()
+
+    # Order by id as well so pages stay stable when sort values tie
+    return query.order_by(key, tie_breaker)
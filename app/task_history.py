@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+from datetime import date, datetime, timezone
+from sqlalchemy import insert
+from app import models
+from app.config import TASK_EVENT_BATCH_SIZE, TASK_EVENT_FLUSH_MS
+from app.database import SessionLocal
+
+# Bookkeeping columns that every write touches; not worth recording
+IGNORED_FIELDS = {"created_by", "updated_by", "version"}
+
+def compact_changes(values: dict, drop_empty: bool = False) -> dict:
+    """JSON-safe field -> new value map, without bookkeeping columns"""
+    changes = {}
+    for key, value in values.items():
+        if key in IGNORED_FIELDS or (drop_empty and value is None):
+            continue
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        changes[key] = value
+    return changes
+
+class TaskEventLog:
+    """In-process queue of task events, written to task_events by a background thread.
+
+    Requests only enqueue, so recording history adds no database work to them.
+    The writer inserts whatever has queued up, at most batch_size rows per
+    transaction, every flush_interval seconds. A failed batch is retried with
+    exponential backoff, then written row by row so only rows that can't be
+    stored are lost.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 0.2, retries: int = 4, retry_delay: float = 0.1):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="task-history", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer after flushing everything still queued"""
+        with self._lock:
+            if not self.running:
+                return
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def record(self, task_id: int, actor_id: int, action: str, changes: dict = None):
+        if not self.running:
+            self.start()
+        self._queue.put({
+            "task_id": task_id,
+            "actor_id": actor_id,
+            "action": action,
+            # Unset fields say nothing on creation, but an update to None clears a field
+            "changes": compact_changes(changes or {}, drop_empty=action == "created"),
+            "created_at": datetime.now(timezone.utc),
+        })
+
+    def flush(self):
+        """Write every queued event, in batches of at most batch_size"""
+        while True:
+            rows = []
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not rows:
+                return
+            if self._write(rows, self.retries) is None:
+                continue
+            # Still failing: find the rows that can't be written and drop only those
+            errors = [error for error in (self._write([row], 0) for row in rows) if error is not None]
+            if errors:
+                print(f"⚠️ Dropped {len(errors)} task history events: {errors[-1]}")
+
+    def _write(self, rows: list, retries: int):
+        """Insert rows in one transaction, retrying with backoff; returns the last error or None"""
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            db = SessionLocal()
+            try:
+                db.execute(insert(models.TaskEvent), rows)
+                db.commit()
+                return None
+            except Exception as e:
+                db.rollback()
+                error = e
+            finally:
+                db.close()
+        return error
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+task_events = TaskEventLog(
+    batch_size=TASK_EVENT_BATCH_SIZE,
+    flush_interval=TASK_EVENT_FLUSH_MS / 1000
+)
@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+from itertools import islice
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.task_filters import PRIORITIES
+from app.task_history import task_events
+from app.task_summary import invalidate_task_summary
+from app.write_batcher import run_write
+
+IMPORT_CHUNK_SIZE = 2000
+# Keep the error report bounded for files that are wrong throughout
+MAX_REPORTED_ERRORS = 1000
+
+def detect_format(upload: UploadFile, fmt: str = None) -> str:
+    """Use the explicit format, else go by the file extension"""
+    if fmt:
+        return fmt
+    name = (upload.filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise HTTPException(status_code=400, detail="Could not tell the file format, pass format=csv or format=ndjson")
+
+def iter_records(upload: UploadFile, fmt: str):
+    """Yield (row number, raw dict or parse error) one record at a time"""
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(stream), start=1):
+            # Empty cells mean "not given"
+            yield number, {key: (value if value != "" else None) for key, value in record.items() if key}
+    else:
+        number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, f"invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield number, "each line must be a JSON object"
+                continue
+            yield number, record
+
+def validate_record(record: dict):
+    """Return (username, AdminTaskCreate) or a list of error messages"""
+    errors = []
+    username = record.get("username")
+    if not username:
+        errors.append("username is required")
+    try:
+        task = schemas.AdminTaskCreate(**{key: value for key, value in record.items() if key != "username"})
+    except ValidationError as e:
+        errors += [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+        return errors
+    if task.priority and task.priority not in PRIORITIES:
+        errors.append("priority must be one of: low, medium, high, urgent")
+    return errors or (username, task)
+
+def import_tasks(db: Session, upload: UploadFile, fmt: str, admin: models.User) -> schemas.TaskImportResult:
+    """Stream the upload and insert valid rows in chunks, one transaction per chunk.
+
+    Chunks that were inserted stay inserted if a later part of the file can't be read.
+    """
+    owner_ids = {}  # username -> id, or None for unknown/deleted users
+    imported = 0
+    errors = []
+    error_count = 0
+
+    def fail(number, messages):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(schemas.TaskImportError(row=number, errors=messages))
+
+    records = iter_records(upload, fmt)
+    try:
+        while True:
+            chunk = list(islice(records, IMPORT_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            valid = []
+            for number, record in chunk:
+                if isinstance(record, str):
+                    fail(number, [record])
+                    continue
+                outcome = validate_record(record)
+                if isinstance(outcome, list):
+                    fail(number, outcome)
+                else:
+                    valid.append((number, *outcome))
+
+            # Resolve this chunk's new usernames in one query
+            unseen = {username for _, username, _ in valid} - owner_ids.keys()
+            if unseen:
+                owner_ids.update(dict.fromkeys(unseen))
+                owner_ids.update(db.query(models.User.username, models.User.id).filter(
+                    models.User.username.in_(unseen),
+                    models.User.is_deleted == False
+                ).all())
+
+            rows = []
+            for number, username, task in valid:
+                if owner_ids[username] is None:
+                    fail(number, [f"user '{username}' not found"])
+                    continue
+                rows.append(dict(
+                    title=task.title,
+                    description=task.description,
+                    status=task.status,
+                    priority=task.priority,
+                    due_datetime=task.due_date,
+                    start_datetime=task.start_datetime,
+                    end_datetime=task.end_datetime,
+                    owner_id=owner_ids[username],
+                    created_by=admin.id,
+                    updated_by=admin.id
+                ))
+            if not rows:
+                continue
+
+            def write(session: Session, rows=rows):
+                # Ids come back in the order of rows, so events match their tasks
+                return session.scalars(
+                    insert(models.Task).returning(models.Task.id, sort_by_parameter_order=True),
+                    rows
+                ).all()
+
+            task_ids = run_write(db, write)
+            imported += len(task_ids)
+            invalidate_task_summary(*{row["owner_id"] for row in rows})
+            for task_id, row in zip(task_ids, rows):
+                task_events.record(task_id, admin.id, "created", row)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read upload after {imported} imported tasks: {e}")
+
+    # Unknown owners are only found after the rest of their chunk was validated
+    errors.sort(key=lambda error: error.row)
+    return schemas.TaskImportResult(imported=imported, failed=error_count, errors=errors)
@@ -0,0 +1,123 @@
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.config import TASK_SUMMARY_CACHE_SECONDS
+
+# owner_id -> (expires_at, marker, summary); a short-lived per-process cache.
+# Invalidation only reaches this process, so an entry is also checked against
+# the owner's write marker (see _write_marker) before it is served
+_cache = {}
+# owner_id -> write generation, bumped on every invalidation so a summary
+# computed before a write never lands in the cache after it
+_generations = {}
+# Bumped when every owner's summary has to go at once
+_epoch = 0
+_lock = threading.Lock()
+
+def invalidate_task_summary(*owner_ids):
+    """Drop cached summaries for owners whose tasks were just written"""
+    with _lock:
+        for owner_id in owner_ids:
+            if owner_id is None:
+                continue
+            _cache.pop(owner_id, None)
+            _generations[owner_id] = _generations.get(owner_id, 0) + 1
+
+def invalidate_all_task_summaries():
+    """Drop every cached summary, for writes whose previous owner isn't known"""
+    global _epoch
+    with _lock:
+        _cache.clear()
+        _epoch += 1
+
+# Status and priority are nullable; tasks without one are counted under this key
+UNSET_KEY = "none"
+
+def grouping_key(column):
+    """Column to group counts by, with NULL mapped to UNSET_KEY"""
+    return func.coalesce(column, UNSET_KEY)
+
+def overdue_condition(now: datetime):
+    """Past due and not yet completed"""
+    return (
+        models.Task.due_datetime.isnot(None)
+        & (models.Task.due_datetime < now)
+        & models.Task.completion_datetime.is_(None)
+        & (grouping_key(models.Task.status) != "completed")
+    )
+
+def _write_marker(db: Session, owner_id: int) -> tuple:
+    """Live task count and latest updated_at, read from ix_tasks_owner_updated alone.
+
+    Every create, update, delete or reassignment changes one of them, so a
+    write made by another worker process is noticed here. A write whose
+    timestamp falls behind a concurrent one by the time it commits can slip
+    past; the cache TTL still bounds that.
+    """
+    return tuple(db.query(func.count(models.Task.id), func.max(models.Task.updated_at)).filter(
+        models.Task.owner_id == owner_id,
+        models.Task.is_deleted == False
+    ).one())
+
+def compute_task_summary(db: Session, owner_id: int) -> schemas.TaskSummary:
+    """Count an owner's tasks by status and priority in a single grouped query"""
+    return _summarize(db, owner_id)[0]
+
+def _summarize(db: Session, owner_id: int):
+    """The owner's summary along with the write marker it was computed at"""
+    now = datetime.now(timezone.utc)
+    status = grouping_key(models.Task.status)
+    priority = grouping_key(models.Task.priority)
+
+    rows = db.query(
+        status,
+        priority,
+        func.count(models.Task.id),
+        func.sum(case((overdue_condition(now), 1), else_=0)),
+        func.sum(case((models.Task.status == "completed", 1), else_=0)),
+        func.max(models.Task.updated_at),
+    ).filter(
+        models.Task.owner_id == owner_id,
+        models.Task.is_deleted == False
+    ).group_by(status, priority).all()
+
+    total = overdue = completed = 0
+    last_updated = None
+    by_status = {}
+    by_priority = {}
+    for status, priority, count, overdue_count, completed_count, updated_at in rows:
+        total += count
+        if last_updated is None or updated_at > last_updated:
+            last_updated = updated_at
+        overdue += overdue_count or 0
+        completed += completed_count or 0
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+
+    summary = schemas.TaskSummary(
+        total=total,
+        by_status=by_status,
+        by_priority=by_priority,
+        overdue=overdue,
+        completed=completed,
+        completion_rate=round(completed / total, 4) if total else 0.0
+    )
+    return summary, (total, last_updated)
+
+def get_task_summary(db: Session, owner_id: int) -> schemas.TaskSummary:
+    """Return the owner's summary, serving it from cache when still fresh"""
+    with _lock:
+        cached = _cache.get(owner_id)
+        generation = (_epoch, _generations.get(owner_id, 0))
+    if cached and cached[0] > time.monotonic() and cached[1] == _write_marker(db, owner_id):
+        return cached[2]
+
+    summary, marker = _summarize(db, owner_id)
+
+    with _lock:
+        if (_epoch, _generations.get(owner_id, 0)) == generation:
+            _cache[owner_id] = (time.monotonic() + TASK_SUMMARY_CACHE_SECONDS, marker, summary)
+    return summary
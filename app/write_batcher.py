@@ -0,0 +1,137 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import TASK_WRITE_BATCHING, TASK_WRITE_BATCH_SIZE, TASK_WRITE_BATCH_DELAY_MS
+from app.database import create_db_engine
+
+class WriteBatcher:
+    """Single writer that applies queued task writes in shared transactions.
+
+    Each write is a callable taking a Session and returning plain data (not ORM
+    objects, which expire on commit). Writes signal expected failures such as
+    404/409 by raising HTTPException before changing anything, so the rest of
+    the batch can still commit. Any other error rolls the batch back and each
+    write is retried in its own transaction, so one bad write can't fail the others.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_delay: float = 0.005):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        # The writer has a connection of its own, so it never competes with
+        # request sessions for the shared pool
+        self._sessions = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=create_db_engine(pool_size=1, max_overflow=0)
+        )
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="task-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if not self.running:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, write):
+        """Queue a write and block until its batch has committed"""
+        if not self.running:
+            self.start()
+        future = Future()
+        self._queue.put((write, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._apply(batch)
+            if stopping:
+                return
+
+    def _apply(self, batch):
+        db = self._sessions()
+        try:
+            outcomes = []
+            try:
+                for write, future in batch:
+                    try:
+                        outcomes.append((future, write(db), None))
+                    except HTTPException as e:
+                        outcomes.append((future, None, e))
+                db.commit()
+            except Exception:
+                db.rollback()
+                for write, future in batch:
+                    self._apply_one(db, write, future)
+                return
+            for future, result, error in outcomes:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        finally:
+            db.close()
+
+    def _apply_one(self, db: Session, write, future: Future):
+        try:
+            result = write(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+task_writer = WriteBatcher(
+    max_batch_size=TASK_WRITE_BATCH_SIZE,
+    max_delay=TASK_WRITE_BATCH_DELAY_MS / 1000
+)
+
+def run_write(db: Session, write):
+    """Apply a task write through the batching writer when enabled, else on the request session"""
+    if TASK_WRITE_BATCHING:
+        # Hand the request's connection back to the pool before waiting on the
+        # writer; loaded objects such as current_user stay usable
+        db.close()
+        return task_writer.submit(write)
+    try:
+        result = write(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
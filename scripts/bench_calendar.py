@@ -0,0 +1,81 @@
+"""Calendar window lookups with the R*Tree side index versus the B-tree fallback.
+
+Fills a throwaway SQLite database with random task spans, then times
+filter_overlapping for a one-week window, across all owners and for one
+owner, once through task_spans and once with the R*Tree switched off.
+
+    python scripts/bench_calendar.py [--tasks 1000000] [--owners 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Point the app at a scratch database before it is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='tms-bench-')}/bench.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import models
+from app.database import SessionLocal, engine
+from app.db_init import init_db
+import app.calendar_index as calendar_index
+
+WINDOW = (datetime(2027, 3, 1), datetime(2027, 3, 8))
+REPEAT = 5
+
+def seed(tasks: int, owners: int):
+    """Insert tasks spanning an hour to a week somewhere in five years; triggers fill the R*Tree"""
+    rng = random.Random(1)
+    base = datetime(2025, 1, 1)
+    rows = []
+    for _ in range(tasks):
+        start = base + timedelta(seconds=rng.randrange(5 * 365 * 86400))
+        end = start + timedelta(seconds=rng.randrange(3600, 7 * 86400))
+        rows.append((rng.randrange(owners) + 2, start.isoformat(" "), end.isoformat(" ")))
+    connection = engine.raw_connection()
+    try:
+        connection.executemany(
+            "INSERT INTO tasks (title, owner_id, start_datetime, end_datetime, is_deleted, status, priority, version) "
+            "VALUES ('Task', ?, ?, ?, 0, 'pending', 'medium', 1)",
+            rows
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+def measure(owner_id, use_rtree: bool):
+    """Return (milliseconds per lookup, matching rows)"""
+    calendar_index.rtree_available = use_rtree
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            found = calendar_index.filter_overlapping(db.query(models.Task.id), *WINDOW, owner_id=owner_id).all()
+        elapsed = time.perf_counter() - started
+    return elapsed / REPEAT * 1000, len(found)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="tasks to insert")
+    parser.add_argument("--owners", type=int, default=1000, help="owners the tasks are spread over")
+    args = parser.parse_args()
+
+    init_db()
+    if not calendar_index.rtree_available:
+        sys.exit("This SQLite build has no R*Tree support")
+    started = time.perf_counter()
+    seed(args.tasks, args.owners)
+    print(f"Inserted {args.tasks} tasks over {args.owners} owners in {time.perf_counter() - started:.1f}s")
+
+    print(f"{'lookup':>10} {'rows':>6} {'rtree ms':>9} {'b-tree ms':>10}")
+    for label, owner_id in (("all", None), ("one owner", args.owners // 2)):
+        rtree_ms, rows = measure(owner_id, use_rtree=True)
+        btree_ms, btree_rows = measure(owner_id, use_rtree=False)
+        assert rows == btree_rows, f"R*Tree found {rows} tasks, the B-tree path {btree_rows}"
+        print(f"{label:>10} {rows:>6} {rtree_ms:>9.1f} {btree_ms:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Throughput of concurrent task updates with and without write batching.
+
+Drives PUT /tasks/{id} through the routers (request sessions, auth and all)
+from more threads than the connection pool holds, against a throwaway SQLite
+database, and reports writes per second for each mode.
+
+    python scripts/bench_write_batching.py [--threads 16,64] [--writes 2000]
+
+Needs httpx for FastAPI's TestClient.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Point the app at a scratch database before it is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='tms-bench-')}/bench.db"
+os.environ["TASK_WRITE_BATCHING"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+import app.write_batcher as write_batcher
+from app.database import engine
+from app.main import app
+
+def login(client, username, password):
+    response = client.post("/auth/login", data={"username": username, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def seed(client, tasks: int):
+    admin = login(client, "admin", "admin123")
+    user = client.post("/users/", json={"username": "bench", "email": "bench@example.com", "password": "secret"}, headers=admin).json()
+    task_ids = [
+        client.post(f"/admin/users/{user['id']}/tasks", json={"title": f"Task {i}"}, headers=admin).json()["id"]
+        for i in range(tasks)
+    ]
+    return login(client, "bench", "secret"), task_ids
+
+def run(client, headers, task_ids, threads: int, writes: int, batching: bool):
+    """Return (successful writes per second, failed writes)"""
+    write_batcher.TASK_WRITE_BATCHING = batching
+    failures = 0
+
+    def put(i):
+        task_id = task_ids[i % len(task_ids)]
+        return client.put(f"/tasks/{task_id}", json={"start_datetime": f"2030-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00"}, headers=headers).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for status in pool.map(put, range(writes)):
+            failures += status != 200
+    elapsed = time.perf_counter() - started
+    write_batcher.task_writer.stop()
+    return (writes - failures) / elapsed, failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", default="16,64", help="comma-separated thread counts")
+    parser.add_argument("--writes", type=int, default=2000, help="writes per run")
+    parser.add_argument("--tasks", type=int, default=200, help="tasks the writes are spread over")
+    args = parser.parse_args()
+
+    pool_limit = engine.pool.size() + engine.pool._max_overflow
+    # Count server errors (e.g. "database is locked") as failed writes instead of raising
+    with TestClient(app, raise_server_exceptions=False) as client:
+        headers, task_ids = seed(client, args.tasks)
+        print(f"Connection pool holds {pool_limit}; {args.writes} writes per run")
+        print(f"{'threads':>8} {'direct/s':>10} {'failed':>7} {'batched/s':>10} {'failed':>7}")
+        for threads in (int(value) for value in args.threads.split(",")):
+            direct, direct_failed = run(client, headers, task_ids, threads, args.writes, batching=False)
+            batched, batched_failed = run(client, headers, task_ids, threads, args.writes, batching=True)
+            print(f"{threads:>8} {direct:>10.0f} {direct_failed:>7} {batched:>10.0f} {batched_failed:>7}")
+
+if __name__ == "__main__":
+    main()
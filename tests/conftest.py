@@ -0,0 +1,51 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway database before anything imports it, and keep
+# task writes on the request thread so each request's SQL is its own
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='tms-tests-')}/test.db"
+os.environ["TASK_WRITE_BATCHING"] = "false"
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+_names = itertools.count(1)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-budgets",
+        action="store_true",
+        help="rewrite tests/query_budgets.json from the query counts observed"
+    )
+
+def login(client, username, password):
+    response = client.post("/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return login(client, "admin", "admin123")
+
+def create_user(client, admin_headers, prefix="user"):
+    """Create a regular user; returns {"id", "username", "headers"}"""
+    username = f"{prefix}{next(_names)}"
+    response = client.post("/users/", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "secret"
+    }, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return {"id": response.json()["id"], "username": username, "headers": login(client, username, "secret")}
+
+@pytest.fixture
+def new_user(client, admin_headers):
+    return lambda prefix="user": create_user(client, admin_headers, prefix)
@@ -0,0 +1,39 @@
+import re
+import threading
+from sqlalchemy import event
+
+# Background writers flush on their own schedule; their SQL isn't the request's
+BACKGROUND_THREADS = {"task-history", "task-writer"}
+
+class QueryRecorder:
+    """Record statements run on an engine, with EXPLAIN QUERY PLAN for reads and writes"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.current_thread().name in BACKGROUND_THREADS:
+            return
+        plan = []
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            rows = cursor.connection.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            plan = [row[3] for row in rows]
+        self.statements.append({"sql": statement, "plan": plan})
+
+def unindexed_scans(statements, tables=("tasks", "task_events")):
+    """(plan line, sql) for every plan step that walks one of the tables without an index"""
+    pattern = re.compile(r"^SCAN (%s)\b" % "|".join(map(re.escape, tables)))
+    return [
+        (line, " ".join(statement["sql"].split()))
+        for statement in statements
+        for line in statement["plan"]
+        if pattern.match(line) and "INDEX" not in line
+    ]
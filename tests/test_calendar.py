@@ -0,0 +1,62 @@
+from app import models
+from app.database import SessionLocal, engine
+from app.security import get_password_hash
+from conftest import login
+from querytools import QueryRecorder
+
+WINDOW = {"from": "2031-03-01T00:00:00", "to": "2031-03-08T00:00:00"}
+
+def test_owner_ids_beyond_float_precision_stay_apart(client, admin_headers):
+    # 2**24 and 2**24 + 1 are the same 32-bit float, so the R*Tree can't tell them apart
+    with SessionLocal() as db:
+        for user_id in (2 ** 24, 2 ** 24 + 1):
+            db.add(models.User(
+                id=user_id,
+                username=f"wide{user_id}",
+                email=f"wide{user_id}@example.com",
+                hashed_password=get_password_hash("secret")
+            ))
+        db.commit()
+    for user_id in (2 ** 24, 2 ** 24 + 1):
+        client.post(f"/admin/users/{user_id}/tasks", json={
+            "title": f"Meeting of {user_id}",
+            "start_datetime": "2031-03-02T09:00:00",
+            "end_datetime": "2031-03-02T10:00:00",
+        }, headers=admin_headers)
+
+    for user_id in (2 ** 24, 2 ** 24 + 1):
+        headers = login(client, f"wide{user_id}", "secret")
+        with QueryRecorder(engine) as recorder:
+            mine = client.get("/tasks/calendar", params=WINDOW, headers=headers).json()
+        assert [task["owner_id"] for task in mine] == [user_id]
+        # The R*Tree still drives the lookup
+        assert any("task_spans VIRTUAL TABLE INDEX" in line for statement in recorder.statements for line in statement["plan"])
+
+        admin_view = client.get("/admin/tasks/calendar", params={**WINDOW, "owner_id": user_id}, headers=admin_headers).json()
+        assert [task["owner_id"] for task in admin_view] == [user_id]
+
+def test_calendar_window_is_bounded(client, admin_headers, new_user):
+    user = new_user()
+    for url, headers in (("/tasks/calendar", user["headers"]), ("/admin/tasks/calendar", admin_headers)):
+        too_long = client.get(url, params={"from": "1900-01-01T00:00:00", "to": "2200-01-01T00:00:00"}, headers=headers)
+        assert too_long.status_code == 400
+        reversed_window = client.get(url, params={"from": "2031-03-08T00:00:00", "to": "2031-03-01T00:00:00"}, headers=headers)
+        assert reversed_window.status_code == 400
+        longest = client.get(url, params={"from": "2031-01-01T00:00:00", "to": "2031-03-04T00:00:00"}, headers=headers)
+        assert longest.status_code == 200
+        assert client.get(url, params={**WINDOW, "limit": 1001}, headers=headers).status_code == 422
+
+def test_calendar_limit_keeps_the_earliest_tasks(client, admin_headers, new_user):
+    user = new_user()
+    for day in (5, 3, 4, 2):
+        client.post(f"/admin/users/{user['id']}/tasks", json={
+            "title": f"Day {day}",
+            "start_datetime": f"2031-04-0{day}T09:00:00",
+            "end_datetime": f"2031-04-0{day}T10:00:00",
+        }, headers=admin_headers)
+    window = {"from": "2031-04-01T00:00:00", "to": "2031-04-08T00:00:00", "limit": 2}
+
+    mine = client.get("/tasks/calendar", params=window, headers=user["headers"]).json()
+    assert [task["title"] for task in mine] == ["Day 2", "Day 3"]
+    admin_view = client.get("/admin/tasks/calendar", params={**window, "owner_id": user["id"]}, headers=admin_headers).json()
+    assert [task["title"] for task in admin_view] == ["Day 2", "Day 3"]
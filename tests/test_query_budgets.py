@@ -0,0 +1,149 @@
+"""Query-count and query-plan budgets for every API route.
+
+Drives each route of the auth, tasks, users, admin and stats routers and
+records the SQL it runs. A route fails when it runs more statements than its
+entry in query_budgets.json allows, or when one of its statements scans a
+guarded table without an index. Every route must be exercised and budgeted.
+
+    pytest tests/test_query_budgets.py --update-query-budgets
+
+rewrites query_budgets.json from the observed counts.
+"""
+import json
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+import app.write_batcher as write_batcher
+from app.database import engine
+from app.main import app
+from conftest import create_user
+from querytools import QueryRecorder, unindexed_scans
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+ROUTERS = ("auth", "tasks", "users", "admin", "stats")
+# Tables that must never be read by a plain full scan
+DEFAULT_GUARDED_TABLES = ["tasks", "task_events"]
+
+def route_keys():
+    """METHOD /path for every route of the routers under budget"""
+    prefixes = tuple(f"/{name}" for name in ROUTERS)
+    keys = set()
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path.startswith(prefixes):
+            keys.update(f"{method} {route.path}" for method in route.methods)
+    return keys
+
+def seed(client, admin_headers) -> dict:
+    """Create users and tasks through the API; none of this is measured"""
+    users = {name: create_user(client, admin_headers, name) for name in ("alice", "bob", "carol", "dave")}
+    owners = [users["alice"], users["bob"], users["carol"]]
+    task_ids = []
+    for i in range(30):
+        task = client.post(f"/admin/users/{owners[i % 3]['id']}/tasks", json={
+            "title": f"Task {i}",
+            "priority": ["low", "medium", "high", "urgent"][i % 4],
+            "due_date": f"2030-01-{i % 28 + 1:02d}T09:00:00",
+            "start_datetime": f"2030-01-{i % 28 + 1:02d}T08:00:00",
+            "end_datetime": f"2030-01-{i % 28 + 1:02d}T17:00:00",
+        }, headers=admin_headers).json()
+        task_ids.append(task["id"])
+    return {"users": users, "task_ids": task_ids}
+
+def run_scenario(client, admin, seeded: dict):
+    """Call every route at least once; yields (budget key, response) right after each call.
+
+    Only the request itself may run between two yields, it is what gets measured.
+    """
+    users = seeded["users"]
+    alice_id, alice = users["alice"]["id"], users["alice"]["headers"]
+    alice_task = seeded["task_ids"][0]
+
+    yield "POST /auth/login", client.post("/auth/login", data={"username": users["alice"]["username"], "password": "secret"})
+    yield "GET /auth/me", client.get("/auth/me", headers=alice)
+    yield "PUT /auth/me", client.put("/auth/me", json={"email": f"{users['alice']['username']}@example.org"}, headers=alice)
+
+    for params in (
+        {},
+        {"search": "Task"},
+        {"status": "pending", "priority": "high,urgent"},
+        {"due_before": "2030-01-15T00:00:00", "due_after": "2030-01-01T00:00:00", "sort": "due_datetime"},
+        {"sort": "priority", "order": "asc"},
+        {"sort": "updated_at"},
+    ):
+        yield "GET /tasks/", client.get("/tasks/", params=params, headers=alice)
+    yield "GET /tasks/summary", client.get("/tasks/summary", headers=alice)
+    yield "GET /tasks/calendar", client.get("/tasks/calendar", params={"from": "2030-01-01T00:00:00", "to": "2030-01-08T00:00:00"}, headers=alice)
+    created = client.post("/tasks/", json={"title": "Own task", "priority": "low"}, headers=alice)
+    yield "POST /tasks/", created
+    yield "PUT /tasks/{task_id}", client.put(f"/tasks/{alice_task}", json={"status": "completed"}, headers=alice)
+    yield "PUT /tasks/{task_id}", client.put(f"/tasks/{alice_task}", json={"title": "Renamed", "owner_id": users["bob"]["id"]}, headers=admin)
+    yield "GET /tasks/{task_id}/history", client.get(f"/tasks/{alice_task}/history", headers=admin)
+    yield "DELETE /tasks/{task_id}", client.delete(f"/tasks/{created.json()['id']}", headers=alice)
+
+    erin = f"erin{alice_id}"
+    yield "POST /users/", client.post("/users/", json={"username": erin, "email": f"{erin}@example.com", "password": "secret"}, headers=admin)
+    yield "GET /users/", client.get("/users/", params={"search": "a"}, headers=admin)
+    yield "GET /users/", client.get("/users/", params={"search": "*", "with_task_stats": "true"}, headers=admin)
+    yield "GET /users/{user_id}", client.get(f"/users/{alice_id}", headers=admin)
+    yield "PUT /users/{user_id}", client.put(f"/users/{alice_id}", json={"email": f"{users['alice']['username']}@example.net"}, headers=admin)
+    yield "DELETE /users/{user_id}", client.delete(f"/users/{users['dave']['id']}", headers=admin)
+
+    yield "GET /stats/", client.get("/stats/", headers=admin)
+
+    for params in (
+        {},
+        {"search": "alice"},
+        {"status": "pending", "priority": "low", "owner_id": alice_id},
+        {"sort": "due_datetime", "due_before": "2030-01-10T00:00:00"},
+    ):
+        yield "GET /admin/tasks", client.get("/admin/tasks", params=params, headers=admin)
+    yield "GET /admin/tasks/calendar", client.get("/admin/tasks/calendar", params={"from": "2030-01-01T00:00:00", "to": "2030-01-08T00:00:00"}, headers=admin)
+    yield "POST /admin/users/{user_id}/tasks", client.post(f"/admin/users/{alice_id}/tasks", json={"title": "Assigned"}, headers=admin)
+    yield "GET /admin/users/{user_id}/summary", client.get(f"/admin/users/{alice_id}/summary", headers=admin)
+    upload = (
+        "title,username,priority\n"
+        f"Imported 1,{users['alice']['username']},high\n"
+        f"Imported 2,{users['bob']['username']},low\n"
+        "Imported 3,nobody,low\n"
+    )
+    yield "POST /admin/tasks/import", client.post("/admin/tasks/import", files={"file": ("tasks.csv", upload)}, headers=admin)
+
+def test_routes_stay_within_query_budgets(client, admin_headers, request, monkeypatch):
+    # Batched writes run on the writer thread, which the recorder leaves out
+    monkeypatch.setattr(write_batcher, "TASK_WRITE_BATCHING", False)
+    update = request.config.getoption("--update-query-budgets")
+    budgets = json.loads(BUDGET_FILE.read_text())
+    observed = {}
+    failures = []
+
+    calls = run_scenario(client, admin_headers, seed(client, admin_headers))
+    while True:
+        with QueryRecorder(engine) as recorder:
+            try:
+                key, response = next(calls)
+            except StopIteration:
+                break
+        if response.status_code >= 400:
+            failures.append(f"{key}: HTTP {response.status_code} {response.text[:200]}")
+        count = len(recorder.statements)
+        observed[key] = max(count, observed.get(key, 0))
+
+        budget = budgets.get(key)
+        if budget is None:
+            continue
+        if count > budget["max_queries"] and not update:
+            failures.append(f"{key}: {count} queries, budget is {budget['max_queries']}")
+            failures += [f"    {statement['sql'].splitlines()[0][:160]}" for statement in recorder.statements]
+        for line, sql in unindexed_scans(recorder.statements, budget.get("guarded_tables", DEFAULT_GUARDED_TABLES)):
+            failures.append(f"{key}: {line}\n    {sql[:300]}")
+
+    routes = route_keys()
+    failures += [f"{key}: not exercised by the scenario" for key in sorted(routes - observed.keys())]
+    if update:
+        budgets = {key: {**budgets.get(key, {}), "max_queries": observed[key]} for key in sorted(observed)}
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=2) + "\n")
+    else:
+        failures += [f"{key}: no budget in {BUDGET_FILE.name}" for key in sorted(routes - budgets.keys())]
+
+    assert not failures, "Query budget violations:\n" + "\n".join(failures)
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal
+from app.task_history import TaskEventLog, task_events
+
+def test_history_stays_readable_after_delete(client, admin_headers, new_user):
+    user, other = new_user(), new_user()
+    task = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers).json()
+    client.put(f"/tasks/{task['id']}", json={"status": "in_progress"}, headers=user["headers"])
+    assert client.delete(f"/tasks/{task['id']}", headers=user["headers"]).status_code == 200
+    # Stopping flushes every queued event; the next record() restarts the writer
+    task_events.stop()
+
+    for headers in (user["headers"], admin_headers):
+        response = client.get(f"/tasks/{task['id']}/history", headers=headers)
+        assert response.status_code == 200
+        assert [event["action"] for event in response.json()["events"]] == ["deleted", "updated", "created"]
+
+    assert client.get(f"/tasks/{task['id']}/history", headers=other["headers"]).status_code == 404
+
+def queued_log(rows):
+    log = TaskEventLog(retry_delay=0)
+    for row in rows:
+        log._queue.put(row)
+    return log
+
+def event_row(task_id, action="updated"):
+    return {"task_id": task_id, "actor_id": None, "action": action, "changes": {}, "created_at": datetime.now(timezone.utc)}
+
+def stored_actions(task_id):
+    with SessionLocal() as db:
+        return [event.action for event in db.query(models.TaskEvent).filter(models.TaskEvent.task_id == task_id)]
+
+def test_flush_retries_a_failed_batch(client, admin_headers, new_user, monkeypatch):
+    user = new_user()
+    task = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers).json()
+    log = queued_log([event_row(task["id"], "first"), event_row(task["id"], "second")])
+
+    failures = [OperationalError("INSERT INTO task_events", {}, Exception("database is locked"))] * 2
+    execute = Session.execute
+    def flaky_execute(self, *args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return execute(self, *args, **kwargs)
+    monkeypatch.setattr(Session, "execute", flaky_execute)
+
+    log.flush()
+    assert stored_actions(task["id"]) == ["first", "second"]
+
+def test_flush_drops_only_rows_that_cannot_be_written(client, admin_headers, new_user):
+    user = new_user()
+    task = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers).json()
+    log = queued_log([event_row(task["id"], "kept"), event_row(task["id"], None), event_row(task["id"], "also kept")])
+
+    log.flush()
+    assert stored_actions(task["id"]) == ["kept", "also kept"]
@@ -0,0 +1,88 @@
+import json
+
+from app.task_history import task_events
+
+def test_import_records_created_events_against_the_right_tasks(client, admin_headers, new_user):
+    alice, bob = new_user(), new_user()
+    content = (
+        "title,username,priority\n"
+        f"First,{alice['username']},high\n"
+        "Orphan,nobody,low\n"
+        f"Second,{bob['username']},low\n"
+        f"Third,{alice['username']},urgent\n"
+    )
+    response = upload(client, admin_headers, "tasks.csv", content)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (3, 1)
+    assert result["errors"][0]["row"] == 2
+
+    # Stopping flushes every queued event; the next record() restarts the writer
+    task_events.stop()
+    imported = {
+        task["title"]: task
+        for user in (alice, bob)
+        for task in client.get("/admin/tasks", params={"owner_id": user["id"]}, headers=admin_headers).json()["tasks"]
+    }
+    assert set(imported) == {"First", "Second", "Third"}
+    for title, task in imported.items():
+        events = client.get(f"/tasks/{task['id']}/history", headers=admin_headers).json()["events"]
+        assert [(event["action"], event["changes"]["title"]) for event in events] == [("created", title)]
+
+def upload(client, admin_headers, name, content, **params):
+    return client.post("/admin/tasks/import", params=params, files={"file": (name, content)}, headers=admin_headers)
+
+def owned_titles(client, admin_headers, user):
+    tasks = client.get("/admin/tasks", params={"owner_id": user["id"], "limit": 100}, headers=admin_headers).json()["tasks"]
+    return sorted(task["title"] for task in tasks)
+
+def test_ndjson_import_reports_each_bad_line(client, admin_headers, new_user):
+    user = new_user()
+    lines = [
+        json.dumps({"title": "Good", "username": user["username"], "due_date": "2030-01-01T09:00:00"}),
+        "",
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"username": user["username"]}),
+        json.dumps({"title": "Bad date", "username": user["username"], "due_date": "someday"}),
+        json.dumps({"title": "Bad priority", "username": user["username"], "priority": "whenever"}),
+        json.dumps({"title": "No owner"}),
+        json.dumps({"title": "Also good", "username": user["username"], "priority": "urgent"}),
+    ]
+    response = upload(client, admin_headers, "tasks.ndjson", "\n".join(lines) + "\n")
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (2, 6)
+
+    # Blank lines aren't rows, so numbering skips them
+    errors = {error["row"]: error["errors"] for error in result["errors"]}
+    assert sorted(errors) == [2, 3, 4, 5, 6, 7]
+    assert errors[2][0].startswith("invalid JSON")
+    assert errors[3] == ["each line must be a JSON object"]
+    assert any(message.startswith("title:") for message in errors[4])
+    assert any(message.startswith("due_date:") for message in errors[5])
+    assert errors[6] == ["priority must be one of: low, medium, high, urgent"]
+    assert errors[7] == ["username is required"]
+    assert owned_titles(client, admin_headers, user) == ["Also good", "Good"]
+
+def test_csv_import_treats_empty_cells_as_unset(client, admin_headers, new_user):
+    user = new_user()
+    content = f"title,username,priority,description\nDefaults,{user['username']},,\n"
+    result = upload(client, admin_headers, "tasks.csv", content).json()
+    assert (result["imported"], result["failed"]) == (1, 0)
+    task = client.get("/admin/tasks", params={"owner_id": user["id"]}, headers=admin_headers).json()["tasks"][0]
+    assert (task["priority"], task["description"]) == ("medium", None)
+
+def test_import_format_detection(client, admin_headers, new_user):
+    user = new_user()
+    line = json.dumps({"title": "Detected", "username": user["username"]}) + "\n"
+
+    assert upload(client, admin_headers, "tasks.jsonl", line).json()["imported"] == 1
+    assert upload(client, admin_headers, "export.txt", line, format="ndjson").json()["imported"] == 1
+    assert upload(client, admin_headers, "tasks.CSV", f"title,username\nUpper,{user['username']}\n").json()["imported"] == 1
+
+    unknown = upload(client, admin_headers, "export.txt", line)
+    assert unknown.status_code == 400
+    assert "format" in unknown.json()["detail"]
+    assert upload(client, admin_headers, "tasks.csv", line, format="xml").status_code == 422
+    assert owned_titles(client, admin_headers, user) == ["Detected", "Detected", "Upper"]
@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from app.database import engine
+from conftest import create_user
+from querytools import QueryRecorder, unindexed_scans
+
+FILTERS = list(itertools.product(
+    [None, "pending,in_progress"],                          # status
+    [None, "high,urgent"],                                  # priority
+    [None, ("2030-01-01T00:00:00", "2030-02-01T00:00:00")],  # due_after, due_before
+))
+SORTS = list(itertools.product(["created_at", "due_datetime", "priority", "updated_at"], ["asc", "desc"]))
+ENDPOINTS = ["user", "admin", "admin_owner"]
+
+@pytest.fixture(scope="module")
+def owner(client, admin_headers):
+    user = create_user(client, admin_headers, "planner")
+    for i in range(6):
+        client.post(f"/admin/users/{user['id']}/tasks", json={
+            "title": f"Task {i}",
+            "priority": ["low", "medium", "high", "urgent"][i % 4],
+            "due_date": f"2030-01-{i + 1:02d}T09:00:00",
+        }, headers=admin_headers)
+    return user
+
+@pytest.mark.parametrize("sort,order", SORTS)
+@pytest.mark.parametrize("status,priority,due", FILTERS)
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_task_list_never_scans_tasks(client, admin_headers, owner, endpoint, status, priority, due, sort, order):
+    params = {"sort": sort, "order": order}
+    if status:
+        params["status"] = status
+    if priority:
+        params["priority"] = priority
+    if due:
+        params["due_after"], params["due_before"] = due
+
+    if endpoint == "user":
+        path, headers = "/tasks/", owner["headers"]
+    else:
+        path, headers = "/admin/tasks", admin_headers
+        if endpoint == "admin_owner":
+            params["owner_id"] = owner["id"]
+
+    with QueryRecorder(engine) as recorder:
+        response = client.get(path, params=params, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert any("FROM tasks" in statement["sql"] for statement in recorder.statements)
+    assert unindexed_scans(recorder.statements) == []
+
+def test_priority_sort_ranks_by_urgency(client, owner):
+    response = client.get("/tasks/", params={"sort": "priority"}, headers=owner["headers"])
+    priorities = [task["priority"] for task in response.json()["tasks"]]
+    rank = ["low", "medium", "high", "urgent"]
+    assert priorities == sorted(priorities, key=rank.index, reverse=True)
+
+def test_invalid_priority_filter_is_rejected(client, owner):
+    response = client.get("/tasks/", params={"priority": "bogus"}, headers=owner["headers"])
+    assert response.status_code == 400
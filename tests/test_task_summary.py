@@ -0,0 +1,103 @@
+from sqlalchemy import update
+
+from app import models, task_summary
+from app.database import SessionLocal, engine
+from querytools import QueryRecorder, unindexed_scans
+
+def test_tasks_without_status_or_priority_are_counted_under_none(client, admin_headers, new_user):
+    user = new_user()
+    assert client.post("/tasks/", json={"title": "Bare", "status": None, "priority": None}, headers=user["headers"]).status_code == 200
+    task = client.post("/tasks/", json={"title": "Cleared", "due_datetime": "2000-01-01T00:00:00"}, headers=user["headers"]).json()
+    assert client.put(f"/tasks/{task['id']}", json={"status": None}, headers=user["headers"]).status_code == 200
+
+    for url, headers in (("/tasks/summary", user["headers"]), (f"/admin/users/{user['id']}/summary", admin_headers)):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        summary = response.json()
+        assert summary["by_status"] == {"none": 2}
+        assert summary["by_priority"] == {"none": 1, "medium": 1}
+        # A task without a status isn't completed, so past its due date it's overdue
+        assert summary["overdue"] == 1
+
+def test_cached_summary_notices_writes_from_other_workers(client, admin_headers, new_user):
+    user = new_user()
+    task = client.post("/tasks/", json={"title": "Task"}, headers=user["headers"]).json()
+    assert client.get("/tasks/summary", headers=user["headers"]).json()["by_status"] == {"pending": 1}
+
+    # Another worker's write reaches the database but not this process's cache
+    with SessionLocal() as db:
+        db.execute(update(models.Task).where(models.Task.id == task["id"]).values(status="completed"))
+        db.commit()
+
+    summary = client.get("/tasks/summary", headers=user["headers"]).json()
+    assert summary["by_status"] == {"completed": 1}
+    assert summary["completed"] == 1
+
+def test_summary_counts_statuses_priorities_and_overdue(client, admin_headers, new_user):
+    user = new_user()
+    for fields in (
+        {"status": "completed", "priority": "high"},
+        {"status": "completed", "priority": "low", "due_date": "2000-01-01T00:00:00"},
+        {"status": "pending", "priority": "high", "due_date": "2000-01-01T00:00:00"},
+        {"status": "in_progress", "priority": "urgent", "due_date": "2999-01-01T00:00:00"},
+    ):
+        client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task", **fields}, headers=admin_headers)
+    deleted = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Gone"}, headers=admin_headers).json()
+    client.delete(f"/tasks/{deleted['id']}", headers=user["headers"])
+
+    assert client.get("/tasks/summary", headers=user["headers"]).json() == {
+        "total": 4,
+        "by_status": {"completed": 2, "pending": 1, "in_progress": 1},
+        "by_priority": {"high": 2, "low": 1, "urgent": 1},
+        "overdue": 1,
+        "completed": 2,
+        "completion_rate": 0.5,
+    }
+
+def test_summary_of_a_user_without_tasks(client, new_user):
+    user = new_user()
+    assert client.get("/tasks/summary", headers=user["headers"]).json() == {
+        "total": 0, "by_status": {}, "by_priority": {}, "overdue": 0, "completed": 0, "completion_rate": 0.0
+    }
+
+def test_summary_reads_tasks_once(client, admin_headers, new_user):
+    user = new_user()
+    for priority in ("low", "high", "urgent"):
+        client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task", "priority": priority}, headers=admin_headers)
+
+    # Computed, then served from cache after checking the write marker
+    for _ in range(2):
+        with QueryRecorder(engine) as recorder:
+            assert client.get("/tasks/summary", headers=user["headers"]).status_code == 200
+        task_reads = [statement for statement in recorder.statements if "FROM tasks" in statement["sql"]]
+        assert len(task_reads) == 1
+        assert not unindexed_scans(task_reads)
+
+def test_writes_drop_the_cached_summary(client, admin_headers, new_user):
+    user = new_user()
+    task = client.post("/tasks/", json={"title": "Task"}, headers=user["headers"]).json()
+    client.get("/tasks/summary", headers=user["headers"])
+    assert user["id"] in task_summary._cache
+
+    client.put(f"/tasks/{task['id']}", json={"status": "completed"}, headers=user["headers"])
+    assert user["id"] not in task_summary._cache
+    assert client.get("/tasks/summary", headers=user["headers"]).json()["completed"] == 1
+
+    client.delete(f"/tasks/{task['id']}", headers=user["headers"])
+    assert user["id"] not in task_summary._cache
+    assert client.get("/tasks/summary", headers=user["headers"]).json()["total"] == 0
+
+    client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Assigned"}, headers=admin_headers)
+    assert client.get("/tasks/summary", headers=user["headers"]).json()["total"] == 1
+
+def test_reassigning_a_task_drops_every_cached_summary(client, admin_headers, new_user):
+    user, other = new_user(), new_user()
+    task = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers).json()
+    client.get("/tasks/summary", headers=user["headers"])
+    client.get("/tasks/summary", headers=other["headers"])
+    assert {user["id"], other["id"]} <= task_summary._cache.keys()
+
+    client.put(f"/tasks/{task['id']}", json={"owner_id": other["id"]}, headers=admin_headers)
+    assert not {user["id"], other["id"]} & task_summary._cache.keys()
+    assert client.get("/tasks/summary", headers=user["headers"]).json()["total"] == 0
+    assert client.get("/tasks/summary", headers=other["headers"]).json()["total"] == 1
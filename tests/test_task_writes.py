@@ -0,0 +1,47 @@
+def create_task(client, admin_headers, owner_id, **fields):
+    response = client.post(f"/admin/users/{owner_id}/tasks", json={"title": "Task", **fields}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_update_bumps_version_and_rejects_stale_if_match(client, admin_headers, new_user):
+    user = new_user()
+    task = create_task(client, admin_headers, user["id"])
+    assert task["version"] == 1
+
+    response = client.put(f"/tasks/{task['id']}", json={"status": "completed"}, headers={**user["headers"], "If-Match": '"1"'})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["completion_datetime"] is not None
+
+    stale = client.put(f"/tasks/{task['id']}", json={"status": "pending"}, headers={**user["headers"], "If-Match": '"1"'})
+    assert stale.status_code == 409
+
+def test_if_match_star_matches_any_version(client, admin_headers, new_user):
+    user = new_user()
+    task = create_task(client, admin_headers, user["id"])
+    client.put(f"/tasks/{task['id']}", json={"status": "in_progress"}, headers=user["headers"])
+
+    response = client.put(f"/tasks/{task['id']}", json={"status": "pending"}, headers={**user["headers"], "If-Match": "*"})
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+
+    deleted = client.delete(f"/tasks/{task['id']}", headers={**user["headers"], "If-Match": "*"})
+    assert deleted.status_code == 200
+
+def test_delete_with_stale_version_conflicts(client, admin_headers, new_user):
+    user = new_user()
+    task = create_task(client, admin_headers, user["id"])
+    client.put(f"/tasks/{task['id']}", json={"status": "in_progress"}, headers=user["headers"])
+
+    assert client.delete(f"/tasks/{task['id']}", params={"version": 1}, headers=user["headers"]).status_code == 409
+    assert client.delete(f"/tasks/{task['id']}", params={"version": 2}, headers=user["headers"]).status_code == 200
+    assert client.delete(f"/tasks/{task['id']}", headers=user["headers"]).status_code == 404
+
+def test_users_cannot_touch_other_users_tasks_or_restricted_fields(client, admin_headers, new_user):
+    owner, other = new_user(), new_user()
+    task = create_task(client, admin_headers, owner["id"])
+
+    assert client.put(f"/tasks/{task['id']}", json={"status": "done"}, headers=other["headers"]).status_code == 404
+    assert client.put(f"/tasks/{task['id']}", json={"title": "x"}, headers=owner["headers"]).status_code == 403
+    assert client.delete(f"/tasks/{task['id']}", headers=other["headers"]).status_code == 404
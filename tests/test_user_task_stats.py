@@ -0,0 +1,38 @@
+from app.database import engine
+from querytools import QueryRecorder
+
+def listed_stats(client, admin_headers, users, **params):
+    response = client.get("/users/", params={"search": "taskstats", "limit": 100, **params}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    ids = {user["id"] for user in users}
+    return {user["id"]: user.get("task_stats", "absent") for user in response.json()["users"] if user["id"] in ids}
+
+def test_users_list_includes_task_stats_on_request(client, admin_headers, new_user):
+    busy, idle = new_user("taskstats"), new_user("taskstats")
+    for fields in (
+        {"status": "pending", "due_date": "2000-01-01T00:00:00"},
+        {"status": "pending"},
+        {"status": "in_progress"},
+        {"status": "completed", "due_date": "2000-01-01T00:00:00"},
+    ):
+        client.post(f"/admin/users/{busy['id']}/tasks", json={"title": "Task", **fields}, headers=admin_headers)
+    gone = client.post(f"/admin/users/{busy['id']}/tasks", json={"title": "Gone"}, headers=admin_headers).json()
+    client.delete(f"/tasks/{gone['id']}", headers=busy["headers"])
+    bare = client.post("/tasks/", json={"title": "Bare", "status": None}, headers=busy["headers"]).json()
+    assert bare["status"] is None
+
+    assert listed_stats(client, admin_headers, [busy, idle], with_task_stats="true") == {
+        busy["id"]: {"total": 5, "open": 4, "overdue": 1, "by_status": {"pending": 2, "in_progress": 1, "completed": 1, "none": 1}},
+        idle["id"]: {"total": 0, "open": 0, "overdue": 0, "by_status": {}},
+    }
+    assert listed_stats(client, admin_headers, [busy, idle]) == {busy["id"]: "absent", idle["id"]: "absent"}
+
+def test_task_stats_take_one_query_per_page(client, admin_headers, new_user):
+    users = [new_user("taskstats") for _ in range(3)]
+    for user in users:
+        client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers)
+
+    with QueryRecorder(engine) as recorder:
+        listed = listed_stats(client, admin_headers, users, with_task_stats="true")
+    assert all(stats["total"] == 1 for stats in listed.values()) and len(listed) == 3
+    assert len([statement for statement in recorder.statements if "FROM tasks" in statement["sql"]]) == 1
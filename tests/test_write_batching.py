@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app.write_batcher as write_batcher
+from app.database import engine
+
+@pytest.fixture
+def batching(monkeypatch):
+    monkeypatch.setattr(write_batcher, "TASK_WRITE_BATCHING", True)
+    yield write_batcher.task_writer
+    write_batcher.task_writer.stop()
+
+def test_concurrent_writes_beyond_pool_size_complete(client, admin_headers, new_user, batching):
+    user = new_user()
+    threads = engine.pool.size() + engine.pool._max_overflow + 5
+    task_ids = [
+        client.post(f"/admin/users/{user['id']}/tasks", json={"title": f"Task {i}"}, headers=admin_headers).json()["id"]
+        for i in range(threads)
+    ]
+
+    def complete(task_id):
+        return client.put(f"/tasks/{task_id}", json={"status": "completed"}, headers=user["headers"])
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        responses = list(pool.map(complete, task_ids))
+
+    assert [response.status_code for response in responses] == [200] * threads
+    assert all(response.json()["version"] == 2 for response in responses)
+
+def test_batched_write_errors_reach_their_own_request(client, admin_headers, new_user, batching):
+    user = new_user()
+    task = client.post(f"/admin/users/{user['id']}/tasks", json={"title": "Task"}, headers=admin_headers).json()
+
+    def put(version):
+        return client.put(f"/tasks/{task['id']}", json={"status": "done", "version": version}, headers=user["headers"])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        statuses = sorted(response.status_code for response in pool.map(put, [1, 1]))
+
+    assert statuses == [200, 409]